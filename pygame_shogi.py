@@ -8,9 +8,10 @@
 import pygame
 import sys
 import os
-import copy
+import functools
+from collections import OrderedDict
 from typing import List, Tuple, Optional, Dict
-from shogi_game import ShogiPiece, ShogiBoard
+from shogi_game import ShogiPiece, ShogiBoard, ZOBRIST_PLAYER, zobrist_key
 
 # 色の定義
 COLORS = {
@@ -27,6 +28,11 @@ COLORS = {
     'BLUE': (0, 0, 255)
 }
 
+# 成り駒の表示文字（ShogiPiece.__str__ の対応と同じ）
+PROMOTED_CHARS = {
+    '飛': '龍', '角': '馬', '銀': '全', '桂': '圭', '香': '杏', '歩': 'と'
+}
+
 class PyGameShogi:
     """PyGameを使った将棋ゲーム"""
     
@@ -40,6 +46,16 @@ class PyGameShogi:
         self.CELL_SIZE = self.BOARD_SIZE // 9
         self.BOARD_OFFSET_X = (self.WINDOW_WIDTH - self.BOARD_SIZE) // 2
         self.BOARD_OFFSET_Y = 50
+
+        # 盤面座標 -> スクリーン座標の変換テーブル（毎回の乗算を省く）
+        self._xy_table = [
+            [
+                (self.BOARD_OFFSET_X + col * self.CELL_SIZE,
+                 self.BOARD_OFFSET_Y + row * self.CELL_SIZE)
+                for col in range(9)
+            ]
+            for row in range(9)
+        ]
         
         # PyGameの初期化
         self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
@@ -52,8 +68,40 @@ class PyGameShogi:
         # ゲーム状態
         self.game = ShogiBoard()
         self.selected_pos = None
-        self.possible_moves = []
+        self.possible_moves = set()
         self.promotion_dialog = None
+
+        # 描画で使い回す矩形（毎フレームのRect生成を避ける）
+        self._cell_rect = pygame.Rect(0, 0, self.CELL_SIZE, self.CELL_SIZE)
+        self._inner_rect = pygame.Rect(0, 0, self.CELL_SIZE - 10, self.CELL_SIZE - 10)
+        self._dialog_rect = pygame.Rect(
+            self.WINDOW_WIDTH // 2 - 120, self.WINDOW_HEIGHT // 2 - 60,
+            240, 120
+        )
+
+        # ゲーム状態（王手・詰み）は局面が変わったときだけ再計算する
+        self._game_status = self.game.get_game_status()
+
+        # 再描画が必要かどうか（盤面が静止している間は描画をスキップ）
+        self._dirty = True
+        # 更新された領域のリスト。None は全画面更新を意味する
+        self._dirty_rects: Optional[List[pygame.Rect]] = None
+
+        # 駒のあるマスのミラー。毎フレーム81マスを走査する代わりに、
+        # 局面が変化したときだけ再構築してこのリストを回す
+        self._occupied: List[Tuple[int, int]] = []
+        self._sync_board_mirror()
+
+        # 局面の Zobrist ハッシュ。_make/_unmake で XOR 差分更新する
+        self._hash = self.game.position_hash()
+
+        # 移動生成のメモ化。1回のクリックで同じマスの get_piece_moves が
+        # 複数回呼ばれるため、局面ハッシュ付きのキーでキャッシュする
+        # （ハッシュをキーにすると手順前後で同一局面になっても再利用できる）
+        self._movegen_cache: "OrderedDict[Tuple[int, int, int], List[Tuple[int, int]]]" = OrderedDict()
+
+        # 王手判定の結果キャッシュ（(局面ハッシュ, プレイヤー) -> bool）
+        self._check_cache: Dict[Tuple[int, int], bool] = {}
         
         # 駒の表示用辞書（日本語と英語の両方）
         self.piece_display = {
@@ -78,7 +126,62 @@ class PyGameShogi:
         
         # 日本語フォントが使用可能かチェック
         self.use_japanese = self.test_japanese_font()
-    
+
+        # 表記は起動後に変わらないので、使う側の辞書を1段に畳み込む
+        lang = 'jp' if self.use_japanese else 'en'
+        self._piece_glyph = {k: v[lang] for k, v in self.piece_display.items()}
+
+        # レンダリング済み文字サーフェスのキャッシュ
+        # (表示文字, 色, 180度回転済みか) -> Surface
+        # フォントのラスタライズは毎フレーム行うには重いため、
+        # 全駒種 × 2色 × 2向きを事前にレンダリングしておく
+        self._glyph_cache: Dict[Tuple[str, Tuple[int, int, int], bool], pygame.Surface] = {}
+        self._build_glyph_cache()
+
+        # 駒1枚分のタイル（白地＋枠線＋文字）のキャッシュ
+        # draw_pieces で1回のバッチブリットにまとめるための完成品サーフェス
+        self._tile_cache: Dict[Tuple[str, Tuple[int, int, int], bool], pygame.Surface] = {}
+        # fblits は pygame-ce のみ。無ければ blits にフォールバック
+        self._blit_batch = getattr(self.screen, 'fblits', self.screen.blits)
+
+        # 静的な背景（盤・格子線・座標）は一度だけ描画してサーフェスに焼き込む
+        self._board_bg = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT)).convert()
+        self._paint_board_bg(self._board_bg)
+        self._paint_coordinates(self._board_bg)
+
+        # 持ち駒欄のラベルも不変なので事前レンダリング
+        if self.use_japanese:
+            self._captured_labels = {
+                1: self.font_japanese.render("先手持ち駒:", True, COLORS['TEXT']).convert_alpha(),
+                2: self.font_japanese.render("後手持ち駒:", True, COLORS['TEXT']).convert_alpha(),
+            }
+        else:
+            self._captured_labels = {
+                1: self.font_medium.render("Player 1 Captured:", True, COLORS['TEXT']).convert_alpha(),
+                2: self.font_medium.render("Player 2 Captured:", True, COLORS['TEXT']).convert_alpha(),
+            }
+
+    def _build_glyph_cache(self):
+        """全駒種の文字サーフェスを事前レンダリング"""
+        for piece_char in self.piece_display:
+            display_text = self.get_piece_display_text(piece_char)
+            for color in (COLORS['BLACK'], COLORS['RED']):
+                self._get_glyph(display_text, color, False)
+                self._get_glyph(display_text, color, True)
+
+    def _get_glyph(self, display_text: str, color: Tuple[int, int, int], rotated: bool) -> pygame.Surface:
+        """キャッシュ済みの文字サーフェスを取得（未登録なら作成）"""
+        key = (display_text, color, rotated)
+        glyph = self._glyph_cache.get(key)
+        if glyph is None:
+            if rotated:
+                # 正立のキャッシュを回転させるだけで済ませる（再レンダリング不要）
+                glyph = pygame.transform.rotate(self._get_glyph(display_text, color, False), 180)
+            else:
+                glyph = self.font_japanese.render(display_text, True, color).convert_alpha()
+            self._glyph_cache[key] = glyph
+        return glyph
+
     def setup_fonts(self):
         """フォントを設定"""
         # 基本フォント
@@ -135,143 +238,179 @@ class PyGameShogi:
         except:
             return False
     
+    @functools.lru_cache(maxsize=64)
     def get_piece_display_text(self, piece_str: str) -> str:
         """駒の表示テキストを取得"""
         # vプレフィックスを除去
         clean_piece = piece_str.replace('v', '').strip()
-        
-        if clean_piece in self.piece_display:
-            if self.use_japanese:
-                return self.piece_display[clean_piece]['jp']
-            else:
-                return self.piece_display[clean_piece]['en']
-        
-        # フォールバック
-        return clean_piece if clean_piece else '?'
+
+        # フォールバックは元の文字（空なら '?'）
+        return self._piece_glyph.get(clean_piece, clean_piece if clean_piece else '?')
     
     def screen_to_board_pos(self, screen_x: int, screen_y: int) -> Optional[Tuple[int, int]]:
         """スクリーン座標を盤面座標に変換"""
+        board_size = self.BOARD_SIZE
         board_x = screen_x - self.BOARD_OFFSET_X
         board_y = screen_y - self.BOARD_OFFSET_Y
-        
-        if 0 <= board_x < self.BOARD_SIZE and 0 <= board_y < self.BOARD_SIZE:
-            col = board_x // self.CELL_SIZE
-            row = board_y // self.CELL_SIZE
-            return (row, col)
+
+        if 0 <= board_x < board_size and 0 <= board_y < board_size:
+            cell_size = self.CELL_SIZE
+            return (board_y // cell_size, board_x // cell_size)
         return None
-    
+
     def board_to_screen_pos(self, row: int, col: int) -> Tuple[int, int]:
         """盤面座標をスクリーン座標に変換"""
-        x = self.BOARD_OFFSET_X + col * self.CELL_SIZE
-        y = self.BOARD_OFFSET_Y + row * self.CELL_SIZE
-        return (x, y)
+        return self._xy_table[row][col]
     
     def draw_board(self):
-        """将棋盤を描画"""
+        """将棋盤を描画（事前レンダリング済みの背景をブリット）"""
+        self.screen.blit(self._board_bg, (0, 0))
+
+    def _paint_board_bg(self, target: pygame.Surface):
+        """盤と格子線を指定サーフェスに描画"""
         # 背景
-        self.screen.fill(COLORS['BACKGROUND'])
-        
+        target.fill(COLORS['BACKGROUND'])
+
         # 将棋盤の背景
         board_rect = pygame.Rect(
             self.BOARD_OFFSET_X, self.BOARD_OFFSET_Y,
             self.BOARD_SIZE, self.BOARD_SIZE
         )
-        pygame.draw.rect(self.screen, COLORS['BOARD'], board_rect)
-        
+        pygame.draw.rect(target, COLORS['BOARD'], board_rect)
+
         # 格子線を描画
         for i in range(10):  # 0から9まで（10本の線）
             # 縦線
             x = self.BOARD_OFFSET_X + i * self.CELL_SIZE
             pygame.draw.line(
-                self.screen, COLORS['GRID'],
+                target, COLORS['GRID'],
                 (x, self.BOARD_OFFSET_Y),
                 (x, self.BOARD_OFFSET_Y + self.BOARD_SIZE), 2
             )
-            
+
             # 横線
             y = self.BOARD_OFFSET_Y + i * self.CELL_SIZE
             pygame.draw.line(
-                self.screen, COLORS['GRID'],
+                target, COLORS['GRID'],
                 (self.BOARD_OFFSET_X, y),
                 (self.BOARD_OFFSET_X + self.BOARD_SIZE, y), 2
             )
-    
-    def draw_coordinates(self):
-        """座標を描画"""
+
+    def _paint_coordinates(self, target: pygame.Surface):
+        """座標を指定サーフェスに描画"""
         # 列番号（9-1）
         for col in range(9):
             text = self.font_medium.render(str(9 - col), True, COLORS['TEXT'])
             x = self.BOARD_OFFSET_X + col * self.CELL_SIZE + self.CELL_SIZE // 2 - text.get_width() // 2
             y = self.BOARD_OFFSET_Y - 25
-            self.screen.blit(text, (x, y))
-        
+            target.blit(text, (x, y))
+
         # 行番号（1-9）
         for row in range(9):
             text = self.font_medium.render(str(row + 1), True, COLORS['TEXT'])
             x = self.BOARD_OFFSET_X - 25
             y = self.BOARD_OFFSET_Y + row * self.CELL_SIZE + self.CELL_SIZE // 2 - text.get_height() // 2
-            self.screen.blit(text, (x, y))
+            target.blit(text, (x, y))
     
     def draw_highlights(self):
         """ハイライトを描画"""
         # 選択された駒のハイライト
         if self.selected_pos:
             row, col = self.selected_pos
-            x, y = self.board_to_screen_pos(row, col)
-            highlight_rect = pygame.Rect(x, y, self.CELL_SIZE, self.CELL_SIZE)
-            pygame.draw.rect(self.screen, COLORS['SELECTED'], highlight_rect, 3)
-        
+            self._cell_rect.topleft = self.board_to_screen_pos(row, col)
+            pygame.draw.rect(self.screen, COLORS['SELECTED'], self._cell_rect, 3)
+
         # 可能な移動先のハイライト
         for row, col in self.possible_moves:
             x, y = self.board_to_screen_pos(row, col)
-            highlight_rect = pygame.Rect(x + 5, y + 5, self.CELL_SIZE - 10, self.CELL_SIZE - 10)
-            pygame.draw.rect(self.screen, COLORS['POSSIBLE_MOVE'], highlight_rect, 2)
+            self._inner_rect.topleft = (x + 5, y + 5)
+            pygame.draw.rect(self.screen, COLORS['POSSIBLE_MOVE'], self._inner_rect, 2)
     
+    def _mark_all_dirty(self):
+        """全画面の再描画を要求"""
+        self._dirty = True
+        self._dirty_rects = None
+
+    def _mark_cell_dirty(self, row: int, col: int):
+        """指定マスの再描画を要求（既に全画面更新なら何もしない）"""
+        self._dirty = True
+        if self._dirty_rects is not None:
+            x, y = self.board_to_screen_pos(row, col)
+            self._dirty_rects.append(pygame.Rect(x, y, self.CELL_SIZE, self.CELL_SIZE))
+
+    def _cached_piece_moves(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """get_piece_moves の結果を局面ハッシュ付きでキャッシュ"""
+        key = (self._hash, row, col)
+        moves = self._movegen_cache.get(key)
+        if moves is None:
+            moves = self.game.get_piece_moves(row, col)
+            self._movegen_cache[key] = moves
+            # 古いバージョンのエントリが残らないようサイズを制限
+            if len(self._movegen_cache) > 128:
+                self._movegen_cache.popitem(last=False)
+        return moves
+
+    def _sync_board_mirror(self):
+        """駒のあるマスの一覧を盤面から再構築"""
+        board = self.game.board
+        self._occupied = [
+            (row, col)
+            for row in range(9)
+            for col in range(9)
+            if board[row * 9 + col]
+        ]
+
     def draw_pieces(self):
-        """駒を描画"""
-        for row in range(9):
-            for col in range(9):
-                piece = self.game.board[row][col]
-                if piece:
-                    self.draw_piece(piece, row, col)
-    
+        """駒を描画（全駒を1回のバッチブリットでまとめて描画）"""
+        blits = []
+        board = self.game.board
+        for row, col in self._occupied:
+            x, y = self.board_to_screen_pos(row, col)
+            blits.append((self._get_tile(board[row * 9 + col]), (x + 5, y + 5)))
+        if blits:
+            self._blit_batch(blits)
+
     def draw_piece(self, piece: ShogiPiece, row: int, col: int):
         """個別の駒を描画"""
         x, y = self.board_to_screen_pos(row, col)
-        center_x = x + self.CELL_SIZE // 2
-        center_y = y + self.CELL_SIZE // 2
-        
-        # 駒の背景（五角形風の形）
-        piece_color = COLORS['WHITE']
-        piece_rect = pygame.Rect(x + 5, y + 5, self.CELL_SIZE - 10, self.CELL_SIZE - 10)
-        pygame.draw.rect(self.screen, piece_color, piece_rect)
-        pygame.draw.rect(self.screen, COLORS['BLACK'], piece_rect, 2)
-        
-        # 駒の文字を取得
-        piece_str = str(piece).strip()
-        display_text = self.get_piece_display_text(piece_str)
-        
-        # 色を決定
-        if piece_str.startswith('v'):
-            color = COLORS['RED']  # 後手は赤色
+        self.screen.blit(self._get_tile(piece), (x + 5, y + 5))
+
+    def _piece_key(self, piece: ShogiPiece) -> Tuple[str, Tuple[int, int, int], bool]:
+        """駒の属性から (表示文字, 色, 回転済みか) のキャッシュキーを作る
+
+        str(piece) を経由した文字列加工（strip/replace）を毎フレーム
+        行わず、駒の属性を直接参照する。
+        """
+        if piece.promoted:
+            char = PROMOTED_CHARS.get(piece.piece_type, piece.piece_type)
         else:
-            color = COLORS['BLACK']  # 先手は黒色
-        
-        # テキストをレンダリング
-        text = self.font_japanese.render(display_text, True, color)
-        text_rect = text.get_rect(center=(center_x, center_y))
-        
-        # 後手の駒は上下反転
-        if piece.player == 2:
-            text = pygame.transform.rotate(text, 180)
-            text_rect = text.get_rect(center=(center_x, center_y))
-        
-        self.screen.blit(text, text_rect)
+            char = piece.piece_type
+
+        # 色を決定（後手は赤色、先手は黒色）
+        color = COLORS['RED'] if piece.player == 2 else COLORS['BLACK']
+        return (self.get_piece_display_text(char), color, piece.player == 2)
+
+    def _get_tile(self, piece: ShogiPiece) -> pygame.Surface:
+        """駒1枚分の完成タイルをキャッシュから取得（未登録なら作成）"""
+        key = self._piece_key(piece)
+        display_text, color, _ = key
+        tile = self._tile_cache.get(key)
+        if tile is None:
+            # 駒の背景（五角形風の形）＋枠線＋文字をタイルに焼き込む
+            size = self.CELL_SIZE - 10
+            tile = pygame.Surface((size, size)).convert()
+            tile.fill(COLORS['WHITE'])
+            pygame.draw.rect(tile, COLORS['BLACK'], tile.get_rect(), 2)
+
+            glyph = self._get_glyph(display_text, color, piece.player == 2)
+            tile.blit(glyph, glyph.get_rect(center=(size // 2, size // 2)))
+            self._tile_cache[key] = tile
+        return tile
     
     def draw_status(self):
         """ゲーム状態を描画"""
-        # ゲーム状態を取得
-        game_status = self.game.get_game_status()
+        # ゲーム状態を取得（局面が変わったときに再計算済み）
+        game_status = self._game_status
         
         # 現在のプレイヤー
         if self.use_japanese:
@@ -332,48 +471,34 @@ class PyGameShogi:
         """持ち駒を描画"""
         # 先手の持ち駒（下側）
         y_pos = self.BOARD_OFFSET_Y + self.BOARD_SIZE + 20
-        
-        if self.use_japanese:
-            label_text = "先手持ち駒:"
-            text = self.font_japanese.render(label_text, True, COLORS['TEXT'])
-        else:
-            label_text = "Player 1 Captured:"
-            text = self.font_medium.render(label_text, True, COLORS['TEXT'])
-        
-        self.screen.blit(text, (self.BOARD_OFFSET_X, y_pos))
+        self.screen.blit(self._captured_labels[1], (self.BOARD_OFFSET_X, y_pos))
         
         x_offset = self.BOARD_OFFSET_X + 150
-        for i, piece in enumerate(self.game.captured_pieces[1]):
-            piece_text = self.get_piece_display_text(str(piece).strip())
-            text = self.font_japanese.render(piece_text, True, COLORS['BLACK'])
-            self.screen.blit(text, (x_offset + i * 35, y_pos))
-        
+        i = 0
+        for piece_type, count in self.game.captured_pieces[1].items():
+            # 持ち駒は種類ごとのカウントなので枚数ぶん並べて描画する
+            text = self._get_glyph(self.get_piece_display_text(piece_type), COLORS['BLACK'], False)
+            for _ in range(count):
+                self.screen.blit(text, (x_offset + i * 35, y_pos))
+                i += 1
+
         # 後手の持ち駒（上側）
         y_pos = self.BOARD_OFFSET_Y - 40
-        
-        if self.use_japanese:
-            label_text = "後手持ち駒:"
-            text = self.font_japanese.render(label_text, True, COLORS['TEXT'])
-        else:
-            label_text = "Player 2 Captured:"
-            text = self.font_medium.render(label_text, True, COLORS['TEXT'])
-        
-        self.screen.blit(text, (self.BOARD_OFFSET_X, y_pos))
-        
+        self.screen.blit(self._captured_labels[2], (self.BOARD_OFFSET_X, y_pos))
+
         x_offset = self.BOARD_OFFSET_X + 150
-        for i, piece in enumerate(self.game.captured_pieces[2]):
-            piece_text = self.get_piece_display_text(str(piece).strip())
-            text = self.font_japanese.render(piece_text, True, COLORS['RED'])
-            self.screen.blit(text, (x_offset + i * 35, y_pos))
+        i = 0
+        for piece_type, count in self.game.captured_pieces[2].items():
+            text = self._get_glyph(self.get_piece_display_text(piece_type), COLORS['RED'], False)
+            for _ in range(count):
+                self.screen.blit(text, (x_offset + i * 35, y_pos))
+                i += 1
     
     def draw_promotion_dialog(self):
         """成り選択ダイアログを描画"""
         if self.promotion_dialog:
             # ダイアログ背景
-            dialog_rect = pygame.Rect(
-                self.WINDOW_WIDTH // 2 - 120, self.WINDOW_HEIGHT // 2 - 60,
-                240, 120
-            )
+            dialog_rect = self._dialog_rect
             pygame.draw.rect(self.screen, COLORS['WHITE'], dialog_rect)
             pygame.draw.rect(self.screen, COLORS['BLACK'], dialog_rect, 3)
             
@@ -393,60 +518,100 @@ class PyGameShogi:
     
     def is_valid_move(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
         """移動が有効かチェック"""
-        if not self.game.is_valid_position(from_row, from_col) or not self.game.is_valid_position(to_row, to_col):
+        # 境界チェックはインライン（is_valid_position の呼び出しコスト節約）
+        if not (0 <= from_row < 9 and 0 <= from_col < 9 and 0 <= to_row < 9 and 0 <= to_col < 9):
             return False
         
-        piece = self.game.board[from_row][from_col]
+        piece = self.game.board[from_row * 9 + from_col]
         if not piece or piece.player != self.game.current_player:
             return False
-        
+
+        # 選択中の駒なら、選択時に計算済みの移動先集合をO(1)で参照
+        if (from_row, from_col) == self.selected_pos and self.possible_moves:
+            return (to_row, to_col) in self.possible_moves
+
         # 移動可能かチェック
-        valid_moves = self.game.get_piece_moves(from_row, from_col)
-        return (to_row, to_col) in valid_moves
+        return (to_row, to_col) in self._cached_piece_moves(from_row, from_col)
     
     def can_promote(self, piece: ShogiPiece, from_row: int, to_row: int) -> bool:
         """成ることができるかチェック"""
         return self.game._can_promote(piece, to_row)
     
+    def _make(self, from_row: int, from_col: int, to_row: int, to_col: int) -> Optional[ShogiPiece]:
+        """駒を移動し、取られた駒を返す（O(1)のmake/unmake用）
+
+        盤面・占有ビットボードの更新はエンジン側の _apply_move に委譲し、
+        ここでは Zobrist ハッシュの差分更新だけを行う。
+        """
+        captured = self.game._apply_move(from_row, from_col, to_row, to_col)
+        piece = self.game.board[to_row * 9 + to_col]
+
+        # ハッシュを差分更新（移動元をXORアウト、移動先をXORイン）
+        self._hash ^= zobrist_key(piece, from_row, from_col) ^ zobrist_key(piece, to_row, to_col)
+        if captured:
+            self._hash ^= zobrist_key(captured, to_row, to_col)
+        return captured
+
+    def _unmake(self, from_row: int, from_col: int, to_row: int, to_col: int, captured: Optional[ShogiPiece]):
+        """_make の移動を元に戻す"""
+        piece = self.game.board[to_row * 9 + to_col]
+        self.game._undo_move(from_row, from_col, to_row, to_col, captured)
+
+        # XOR は自己逆元なので同じキーをもう一度適用すれば元に戻る
+        self._hash ^= zobrist_key(piece, from_row, from_col) ^ zobrist_key(piece, to_row, to_col)
+        if captured:
+            self._hash ^= zobrist_key(captured, to_row, to_col)
+
+    def _is_in_check_cached(self, player: int) -> bool:
+        """is_in_check の結果を局面ハッシュでキャッシュ"""
+        key = (self._hash, player)
+        result = self._check_cache.get(key)
+        if result is None:
+            result = self.game.is_in_check(player)
+            if len(self._check_cache) > 1024:
+                self._check_cache.clear()
+            self._check_cache[key] = result
+        return result
+
     def move_piece_with_promotion(self, from_row: int, from_col: int, to_row: int, to_col: int, promote: bool):
         """成り選択付きで駒を移動"""
         if not self.is_valid_move(from_row, from_col, to_row, to_col):
             return False
-        
-        piece = self.game.board[from_row][from_col]
-        
+
+        piece = self.game.board[from_row * 9 + from_col]
+
         # 移動が自分の王を王手に晒すかチェック
-        captured_piece = self.game.board[to_row][to_col]
-        self.game.board[to_row][to_col] = piece
-        self.game.board[from_row][from_col] = None
-        
-        if self.game.is_in_check(self.game.current_player):
+        captured_piece = self._make(from_row, from_col, to_row, to_col)
+
+        if self._is_in_check_cached(self.game.current_player):
             # 移動を元に戻す
-            self.game.board[from_row][from_col] = piece
-            self.game.board[to_row][to_col] = captured_piece
+            self._unmake(from_row, from_col, to_row, to_col, captured_piece)
             print("その移動は自分の王を王手に晒すため無効です。")
             return False
-        
-        # 移動を元に戻してから正式に実行
-        self.game.board[from_row][from_col] = piece
-        self.game.board[to_row][to_col] = captured_piece
-        
-        # 相手の駒を取る場合
+
+        # 合法手なので移動は盤面に残し、取った駒だけ処理する
         if captured_piece:
-            # 持ち駒に追加（成りを解除）
-            captured_piece.promoted = False
-            self.game.captured_pieces[self.game.current_player].append(captured_piece)
-        
-        # 駒を移動
-        self.game.board[to_row][to_col] = piece
-        self.game.board[from_row][from_col] = None
-        
-        # 成り処理
+            # 持ち駒のカウントを増やす（種類だけ記録するので成りは自然に解除）
+            hand = self.game.captured_pieces[self.game.current_player]
+            hand[captured_piece.piece_type] = hand.get(captured_piece.piece_type, 0) + 1
+
+        # 成り処理（ハッシュは成り前をXORアウトしてから成り後をXORイン）
         if promote:
+            delta = zobrist_key(piece, to_row, to_col)
             piece.promoted = True
-        
+            delta ^= zobrist_key(piece, to_row, to_col)
+            self._hash ^= delta
+            # 本体側の差分ハッシュとキャッシュも同期させる
+            self.game.zobrist ^= delta
+            self.game._moves_cache.clear()
+
         # プレイヤー交代
-        self.game.current_player = 2 if self.game.current_player == 1 else 1
+        self.game.current_player = 3 - self.game.current_player  # 1⇔2 を分岐なしで切り替え
+        self._hash ^= ZOBRIST_PLAYER
+        self._sync_board_mirror()
+        self._game_status = self.game.get_game_status()
+        # 盤面に加えて状態表示・持ち駒欄も変わるため全画面更新
+        self._mark_all_dirty()
         return True
     
     def handle_click(self, pos: Tuple[int, int]):
@@ -455,16 +620,21 @@ class PyGameShogi:
         
         if not board_pos:
             return
-        
+
         row, col = board_pos
-        
+
+        # クリック前にハイライトされていたマスは再描画が必要
+        prev_cells = set(self.possible_moves)
+        if self.selected_pos:
+            prev_cells.add(self.selected_pos)
+
         if self.selected_pos is None:
             # 駒を選択
-            piece = self.game.board[row][col]
+            piece = self.game.board[row * 9 + col]
             if piece and piece.player == self.game.current_player:
                 self.selected_pos = (row, col)
                 # 可能な移動先を計算
-                self.possible_moves = self.game.get_piece_moves(row, col)
+                self.possible_moves = set(self._cached_piece_moves(row, col))
         else:
             # 移動を試行
             from_row, from_col = self.selected_pos
@@ -472,10 +642,10 @@ class PyGameShogi:
             if (row, col) == self.selected_pos:
                 # 同じ駒をクリック - 選択解除
                 self.selected_pos = None
-                self.possible_moves = []
+                self.possible_moves = set()
             elif self.is_valid_move(from_row, from_col, row, col):
                 # 有効な移動
-                piece = self.game.board[from_row][from_col]
+                piece = self.game.board[from_row * 9 + from_col]
                 
                 # 成りの判定
                 can_promote = self.can_promote(piece, from_row, row)
@@ -486,21 +656,30 @@ class PyGameShogi:
                         'to': (row, col),
                         'piece': piece
                     }
+                    # ダイアログは盤面中央に重なるので全画面更新
+                    self._mark_all_dirty()
                 else:
                     # 移動実行
                     self.move_piece_with_promotion(from_row, from_col, row, col, False)
                     self.selected_pos = None
-                    self.possible_moves = []
+                    self.possible_moves = set()
             else:
                 # 無効な移動 - 新しい駒を選択
-                piece = self.game.board[row][col]
+                piece = self.game.board[row * 9 + col]
                 if piece and piece.player == self.game.current_player:
                     self.selected_pos = (row, col)
-                    self.possible_moves = self.game.get_piece_moves(row, col)
+                    self.possible_moves = set(self._cached_piece_moves(row, col))
                 else:
                     self.selected_pos = None
-                    self.possible_moves = []
-    
+                    self.possible_moves = set()
+
+        # ハイライトが変わったマスだけを部分更新の対象にする
+        cells = prev_cells | self.possible_moves
+        if self.selected_pos:
+            cells.add(self.selected_pos)
+        for cell_row, cell_col in cells:
+            self._mark_cell_dirty(cell_row, cell_col)
+
     def handle_promotion_input(self, promote: bool):
         """成り選択を処理"""
         if self.promotion_dialog:
@@ -511,8 +690,9 @@ class PyGameShogi:
             
             self.promotion_dialog = None
             self.selected_pos = None
-            self.possible_moves = []
-    
+            self.possible_moves = set()
+            self._mark_all_dirty()
+
     def run(self):
         """メインゲームループ"""
         running = True
@@ -526,59 +706,85 @@ class PyGameShogi:
         print("=" * 30)
         
         while running:
-            # ゲーム状態をチェック
-            game_status = self.game.get_game_status()
-            
-            for event in pygame.event.get():
+            # ゲーム状態をチェック（毎フレーム再計算しない）
+            game_status = self._game_status
+
+            # 入力待ちの間はブロッキング取得にしてCPUを使わない
+            # （再描画待ちが無ければイベントが来るまで眠る）
+            events = pygame.event.get()
+            if not events and not self._dirty:
+                events = [pygame.event.wait()]
+
+            # 連続したクリックは最後の1回だけ処理する
+            # （フレーム間に溜まった分を全部処理しても結果は同じ）
+            last_click = None
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-                
+
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # 左クリック
-                        if not self.promotion_dialog and not game_status['game_over']:
-                            self.handle_click(event.pos)
-                
+                        last_click = event.pos
+
                 elif event.type == pygame.KEYDOWN:
                     if self.promotion_dialog:
                         if event.key == pygame.K_y:
                             self.handle_promotion_input(True)
                         elif event.key == pygame.K_n:
                             self.handle_promotion_input(False)
-                    
+
                     if event.key == pygame.K_ESCAPE:
                         running = False
-                    
+
                     # ゲーム終了後にスペースキーで再開
                     if game_status['game_over'] and event.key == pygame.K_SPACE:
                         self.game = ShogiBoard()
                         self.selected_pos = None
-                        self.possible_moves = []
+                        self.possible_moves = set()
                         self.promotion_dialog = None
-            
-            # 描画
-            self.draw_board()
-            self.draw_coordinates()
-            self.draw_highlights()
-            self.draw_pieces()
-            self.draw_status()
-            
-            if self.promotion_dialog:
-                self.draw_promotion_dialog()
-            
-            # ゲーム終了時の追加メッセージ
-            if game_status['game_over']:
-                if self.use_japanese:
-                    restart_text = "スペースキーで再開 / ESCで終了"
-                    text = self.font_japanese.render(restart_text, True, COLORS['TEXT'])
+                        self._hash = self.game.position_hash()
+                        self._sync_board_mirror()
+                        self._game_status = self.game.get_game_status()
+                        self._mark_all_dirty()
+
+            if last_click is not None:
+                if not self.promotion_dialog and not game_status['game_over']:
+                    self.handle_click(last_click)
+
+            # 描画（状態が変化したフレームのみ再描画する）
+            if self._dirty:
+                self.draw_board()
+                self.draw_highlights()
+                self.draw_pieces()
+                self.draw_status()
+
+                if self.promotion_dialog:
+                    self.draw_promotion_dialog()
+
+                # ゲーム終了時の追加メッセージ
+                if game_status['game_over']:
+                    if self.use_japanese:
+                        restart_text = "スペースキーで再開 / ESCで終了"
+                        text = self.font_japanese.render(restart_text, True, COLORS['TEXT'])
+                    else:
+                        restart_text = "Press SPACE to restart / ESC to quit"
+                        text = self.font_medium.render(restart_text, True, COLORS['TEXT'])
+
+                    text_rect = text.get_rect(center=(self.WINDOW_WIDTH // 2, 130))
+                    self.screen.blit(text, text_rect)
+
+                # 変更領域が小さければ部分更新、大きければ全画面転送
+                rects = self._dirty_rects
+                if rects is None or sum(r.w * r.h for r in rects) * 4 > self.WINDOW_WIDTH * self.WINDOW_HEIGHT:
+                    pygame.display.flip()
                 else:
-                    restart_text = "Press SPACE to restart / ESC to quit"
-                    text = self.font_medium.render(restart_text, True, COLORS['TEXT'])
-                
-                text_rect = text.get_rect(center=(self.WINDOW_WIDTH // 2, 130))
-                self.screen.blit(text, text_rect)
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+                    pygame.display.update(rects)
+                self._dirty = False
+                self._dirty_rects = []
+
+            # ターン制のゲームなので30FPSで十分
+            self.clock.tick(30)
         
         pygame.quit()
         sys.exit()
@@ -5,33 +5,155 @@
 基本的な将棋のルールと盤面表示を含む
 """
 
-import copy
+import array
+import random
 from typing import List, Tuple, Optional, Dict
 
+# 移動方向の定数
+# 移動生成はクリック・王手判定のたびに走るホットパスなので、
+# 方向タプルを呼び出しごとに生成せずモジュールレベルで使い回す
+_KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+_ORTHO_STEPS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+_DIAG_STEPS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+_BISHOP_DIRS = _DIAG_STEPS
+_ROOK_DIRS = _ORTHO_STEPS
+
+# プレイヤーごとに向きを反転した前進系の方向（1: 先手, 2: 後手）
+_GOLD_STEPS = {
+    1: ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0)),
+    2: ((1, -1), (1, 0), (1, 1), (0, -1), (0, 1), (-1, 0)),
+}
+_SILVER_STEPS = {
+    1: ((-1, -1), (-1, 0), (-1, 1), (1, -1), (1, 1)),
+    2: ((1, -1), (1, 0), (1, 1), (-1, -1), (-1, 1)),
+}
+_KNIGHT_STEPS = {
+    1: ((-2, -1), (-2, 1)),
+    2: ((2, -1), (2, 1)),
+}
+_PAWN_STEPS = {1: ((-1, 0),), 2: ((1, 0),)}
+
+
+def _build_step_table(steps):
+    """各マス（sq = row*9+col）から1歩で届く盤内のマスを列挙したテーブル
+
+    要素は (移動先sq, 移動先row, 移動先col)。フラット盤面のインデックスを
+    呼び出しごとに計算し直さずに済むよう事前計算しておく。
+    """
+    table = []
+    for sq in range(81):
+        row, col = divmod(sq, 9)
+        targets = tuple(
+            ((row + dr) * 9 + (col + dc), row + dr, col + dc)
+            for dr, dc in steps
+            if 0 <= row + dr < 9 and 0 <= col + dc < 9
+        )
+        table.append(targets)
+    return tuple(table)
+
+
+# 非飛び駒の移動先テーブル。境界判定を呼び出しごとに繰り返さず、
+# インポート時に1回だけ済ませておく
+_KING_TABLE = _build_step_table(_KING_STEPS)
+_ORTHO_TABLE = _build_step_table(_ORTHO_STEPS)
+_DIAG_TABLE = _build_step_table(_DIAG_STEPS)
+_PAWN_TABLE = {player: _build_step_table(steps) for player, steps in _PAWN_STEPS.items()}
+_GOLD_TABLE = {player: _build_step_table(steps) for player, steps in _GOLD_STEPS.items()}
+_SILVER_TABLE = {player: _build_step_table(steps) for player, steps in _SILVER_STEPS.items()}
+_KNIGHT_TABLE = {player: _build_step_table(steps) for player, steps in _KNIGHT_STEPS.items()}
+
+
+def _build_mask_table(step_table):
+    """ステップテーブルを候補マスのビットマスク（OR）に畳み込む
+
+    占有ビットボードと AND するだけで「候補マスに駒があるか」を
+    一括判定でき、駒がなければ個別チェックのループを丸ごと省ける。
+    """
+    masks = []
+    for targets in step_table:
+        mask = 0
+        for t_sq, _r, _c in targets:
+            mask |= 1 << t_sq
+        masks.append(mask)
+    return tuple(masks)
+
+
+_KING_MASK = _build_mask_table(_KING_TABLE)
+_ORTHO_MASK = _build_mask_table(_ORTHO_TABLE)
+_DIAG_MASK = _build_mask_table(_DIAG_TABLE)
+_PAWN_MASK = {player: _build_mask_table(table) for player, table in _PAWN_TABLE.items()}
+_GOLD_MASK = {player: _build_mask_table(table) for player, table in _GOLD_TABLE.items()}
+_SILVER_MASK = {player: _build_mask_table(table) for player, table in _SILVER_TABLE.items()}
+_KNIGHT_MASK = {player: _build_mask_table(table) for player, table in _KNIGHT_TABLE.items()}
+
+# Zobrist ハッシュ用の乱数表
+# (駒種, プレイヤー, 成り, row, col) -> 64bit 乱数。局面の同一性判定や
+# キャッシュのキーとして使い、駒の移動ごとに XOR で差分更新できる
+_PIECE_TYPES = ('王', '玉', '飛', '角', '金', '銀', '桂', '香', '歩')
+
+# 頻出する駒種の所属判定用セット。呼び出しごとのリスト生成と
+# 線形走査を避け、ハッシュ1回の membership テストにする
+_KING_TYPES = frozenset(('王', '玉'))
+_PROMOTABLE_TYPES = frozenset(('歩', '香', '桂', '銀', '角', '飛'))
+# 成ると金の動きになる駒
+_GOLD_WHEN_PROMOTED = frozenset(('歩', '香', '桂', '銀'))
+
+# 駒種の内部コード（_PIECE_TYPES のインデックス）。内部の比較・分岐は
+# 多バイト文字列ではなく小さな整数で行う（piece_type は公開APIのまま）
+_PIECE_CODES = {piece_type: code for code, piece_type in enumerate(_PIECE_TYPES)}
+_KING_CODE, _JEWEL_CODE, _ROOK_CODE, _BISHOP_CODE, _GOLD_CODE, \
+    _SILVER_CODE, _KNIGHT_CODE, _LANCE_CODE, _PAWN_CODE = range(9)
+_KING_CODES = frozenset((_KING_CODE, _JEWEL_CODE))
+_PROMOTABLE_CODES = frozenset(_PIECE_CODES[t] for t in _PROMOTABLE_TYPES)
+_GOLD_WHEN_PROMOTED_CODES = frozenset(_PIECE_CODES[t] for t in _GOLD_WHEN_PROMOTED)
+_zobrist_rng = random.Random(20240101)
+ZOBRIST_TABLE = {
+    (piece_type, player, promoted, row, col): _zobrist_rng.getrandbits(64)
+    for piece_type in _PIECE_TYPES
+    for player in (1, 2)
+    for promoted in (False, True)
+    for row in range(9)
+    for col in range(9)
+}
+# 手番（後手番のとき XOR する）
+ZOBRIST_PLAYER = _zobrist_rng.getrandbits(64)
+
+
+def zobrist_key(piece: 'ShogiPiece', row: int, col: int) -> int:
+    """駒と位置に対応する Zobrist 乱数値を返す"""
+    return ZOBRIST_TABLE[(piece.piece_type, piece.player, piece.promoted, row, col)]
+
+
+# 駒の表示用文字列（__str__ のたびに辞書を作り直さないようモジュール定数にする）
+_DISPLAY_CHARS = {
+    '王': '王', '玉': '玉', '飛': '飛', '角': '角',
+    '金': '金', '銀': '銀', '桂': '桂', '香': '香', '歩': '歩'
+}
+_PROMOTED_CHARS = {
+    '飛': '龍', '角': '馬', '銀': '全', '桂': '圭', '香': '杏', '歩': 'と'
+}
+
+
 class ShogiPiece:
     """将棋の駒を表すクラス"""
-    
+
+    # フィールドが少ないので __dict__ を持たせず、
+    # 属性アクセスの高速化とメモリ削減を図る
+    __slots__ = ('piece_type', 'player', 'promoted', 'code')
+
     def __init__(self, piece_type: str, player: int, promoted: bool = False):
         self.piece_type = piece_type  # 駒の種類
         self.player = player  # プレイヤー (1: 先手, 2: 後手)
         self.promoted = promoted  # 成り駒かどうか
-    
+        # 内部処理用の整数コード（未知の駒種は -1）
+        self.code = _PIECE_CODES.get(piece_type, -1)
+
     def __str__(self):
-        # 駒の表示用文字列
-        pieces = {
-            '王': '王', '玉': '玉', '飛': '飛', '角': '角',
-            '金': '金', '銀': '銀', '桂': '桂', '香': '香', '歩': '歩'
-        }
-        
-        promoted_pieces = {
-            '飛': '龍', '角': '馬', '銀': '全', '桂': '圭', '香': '杏', '歩': 'と'
-        }
-        
-        if self.promoted and self.piece_type in promoted_pieces:
-            piece_str = promoted_pieces[self.piece_type]
+        if self.promoted and self.piece_type in _PROMOTED_CHARS:
+            piece_str = _PROMOTED_CHARS[self.piece_type]
         else:
-            piece_str = pieces.get(self.piece_type, self.piece_type)
-        
+            piece_str = _DISPLAY_CHARS.get(self.piece_type, self.piece_type)
+
         # 後手の駒は逆さまに表示（実際のゲームでは色分けなど）
         if self.player == 2:
             return f"v{piece_str}"
@@ -42,47 +164,139 @@ class ShogiBoard:
     """将棋盤を表すクラス"""
     
     def __init__(self):
-        self.board = [[None for _ in range(9)] for _ in range(9)]
-        self.captured_pieces = {1: [], 2: []}  # 持ち駒
+        # 長さ81のフラットな盤面（sq = row*9+col）。ネストしたリストより
+        # インデックス1回で済み、走査もキャッシュに乗りやすい
+        self.board: List[Optional[ShogiPiece]] = [None] * 81
+        # 持ち駒。ShogiPiece オブジェクトのリストではなく
+        # {駒種: 枚数} のカウントで持つ（所有者はキー、成りは常に解除）
+        self.captured_pieces: Dict[int, Dict[str, int]] = {1: {}, 2: {}}
         self.current_player = 1  # 現在のプレイヤー
+        # プレイヤーごとの占有ビットボード（bit = row*9+col）
+        # 盤面走査をビット列挙に置き換えるためのミラー
+        self.occupied = {1: 0, 2: 0}
+        # 現局面での合法手キャッシュ。(手番, row, col) -> 移動先リスト。
+        # 盤面が変わる（_apply_move/_undo_move）たびにクリアする
+        self._moves_cache: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+        # 王将/玉将の現在位置。_apply_move/_undo_move で差分更新し、
+        # find_king の全マス走査を O(1) の参照に置き換える
+        self.king_pos: Dict[int, Optional[Tuple[int, int]]] = {1: None, 2: None}
+        # 直前の移動で成りの選択が保留されている位置（なければ None）
+        self.pending_promotion: Optional[Tuple[int, int]] = None
+        # 盤上の駒の Zobrist ハッシュ（手番成分は含まない）。
+        # _apply_move/_undo_move と成り処理で XOR 差分更新する
+        self.zobrist = 0
+        # 詰み判定のメモ化（(盤面ハッシュ, プレイヤー) -> bool）。
+        # 同一局面の再訪で高価な回避手探索を繰り返さない
+        self._checkmate_cache: Dict[Tuple[int, int], bool] = {}
         self.setup_initial_position()
     
     def setup_initial_position(self):
         """初期配置を設定"""
         # 後手の駒配置 (上側)
-        self.board[0][0] = ShogiPiece('香', 2)
-        self.board[0][1] = ShogiPiece('桂', 2)
-        self.board[0][2] = ShogiPiece('銀', 2)
-        self.board[0][3] = ShogiPiece('金', 2)
-        self.board[0][4] = ShogiPiece('玉', 2)  # 後手は玉将
-        self.board[0][5] = ShogiPiece('金', 2)
-        self.board[0][6] = ShogiPiece('銀', 2)
-        self.board[0][7] = ShogiPiece('桂', 2)
-        self.board[0][8] = ShogiPiece('香', 2)
-        
-        self.board[1][1] = ShogiPiece('飛', 2)
-        self.board[1][7] = ShogiPiece('角', 2)
+        self.board[0 * 9 + 0] = ShogiPiece('香', 2)
+        self.board[0 * 9 + 1] = ShogiPiece('桂', 2)
+        self.board[0 * 9 + 2] = ShogiPiece('銀', 2)
+        self.board[0 * 9 + 3] = ShogiPiece('金', 2)
+        self.board[0 * 9 + 4] = ShogiPiece('玉', 2)  # 後手は玉将
+        self.board[0 * 9 + 5] = ShogiPiece('金', 2)
+        self.board[0 * 9 + 6] = ShogiPiece('銀', 2)
+        self.board[0 * 9 + 7] = ShogiPiece('桂', 2)
+        self.board[0 * 9 + 8] = ShogiPiece('香', 2)
+        
+        self.board[1 * 9 + 1] = ShogiPiece('飛', 2)
+        self.board[1 * 9 + 7] = ShogiPiece('角', 2)
         
         for i in range(9):
-            self.board[2][i] = ShogiPiece('歩', 2)
+            self.board[2 * 9 + i] = ShogiPiece('歩', 2)
         
         # 先手の駒配置 (下側)
         for i in range(9):
-            self.board[6][i] = ShogiPiece('歩', 1)
-        
-        self.board[7][1] = ShogiPiece('角', 1)
-        self.board[7][7] = ShogiPiece('飛', 1)
-        
-        self.board[8][0] = ShogiPiece('香', 1)
-        self.board[8][1] = ShogiPiece('桂', 1)
-        self.board[8][2] = ShogiPiece('銀', 1)
-        self.board[8][3] = ShogiPiece('金', 1)
-        self.board[8][4] = ShogiPiece('王', 1)
-        self.board[8][5] = ShogiPiece('金', 1)
-        self.board[8][6] = ShogiPiece('銀', 1)
-        self.board[8][7] = ShogiPiece('桂', 1)
-        self.board[8][8] = ShogiPiece('香', 1)
-    
+            self.board[6 * 9 + i] = ShogiPiece('歩', 1)
+        
+        self.board[7 * 9 + 1] = ShogiPiece('角', 1)
+        self.board[7 * 9 + 7] = ShogiPiece('飛', 1)
+        
+        self.board[8 * 9 + 0] = ShogiPiece('香', 1)
+        self.board[8 * 9 + 1] = ShogiPiece('桂', 1)
+        self.board[8 * 9 + 2] = ShogiPiece('銀', 1)
+        self.board[8 * 9 + 3] = ShogiPiece('金', 1)
+        self.board[8 * 9 + 4] = ShogiPiece('王', 1)
+        self.board[8 * 9 + 5] = ShogiPiece('金', 1)
+        self.board[8 * 9 + 6] = ShogiPiece('銀', 1)
+        self.board[8 * 9 + 7] = ShogiPiece('桂', 1)
+        self.board[8 * 9 + 8] = ShogiPiece('香', 1)
+
+        self._rebuild_occupied()
+
+    def _rebuild_occupied(self):
+        """占有ビットボード・王の位置・Zobrist ハッシュを盤面から作り直す"""
+        occupied = {1: 0, 2: 0}
+        king_pos: Dict[int, Optional[Tuple[int, int]]] = {1: None, 2: None}
+        zobrist = 0
+        for sq in range(81):
+            piece = self.board[sq]
+            if piece:
+                occupied[piece.player] |= 1 << sq
+                if piece.code in _KING_CODES:
+                    king_pos[piece.player] = divmod(sq, 9)
+                row, col = divmod(sq, 9)
+                zobrist ^= ZOBRIST_TABLE[(piece.piece_type, piece.player, piece.promoted, row, col)]
+        self.occupied = occupied
+        self.king_pos = king_pos
+        self.zobrist = zobrist
+        self._checkmate_cache.clear()
+
+    def _apply_move(self, from_row: int, from_col: int, to_row: int, to_col: int) -> Optional['ShogiPiece']:
+        """駒を移動し、取られた駒を返す
+
+        盤面とビットボードを同時に更新する。_undo_move と対で、
+        王手判定のための試し手にも使える O(1) の make/unmake。
+        """
+        self._moves_cache.clear()
+        board = self.board
+        from_sq = from_row * 9 + from_col
+        to_sq = to_row * 9 + to_col
+        piece = board[from_sq]
+        captured = board[to_sq]
+        board[to_sq] = piece
+        board[from_sq] = None
+
+        to_bit = 1 << to_sq
+        self.occupied[piece.player] ^= (1 << from_sq) | to_bit
+        zobrist = zobrist_key(piece, from_row, from_col) ^ zobrist_key(piece, to_row, to_col)
+        if captured:
+            self.occupied[captured.player] ^= to_bit
+            zobrist ^= zobrist_key(captured, to_row, to_col)
+            if captured.code in _KING_CODES:
+                self.king_pos[captured.player] = None
+        if piece.code in _KING_CODES:
+            self.king_pos[piece.player] = (to_row, to_col)
+        self.zobrist ^= zobrist
+        return captured
+
+    def _undo_move(self, from_row: int, from_col: int, to_row: int, to_col: int,
+                   captured: Optional['ShogiPiece']):
+        """_apply_move の移動を元に戻す"""
+        self._moves_cache.clear()
+        board = self.board
+        from_sq = from_row * 9 + from_col
+        to_sq = to_row * 9 + to_col
+        piece = board[to_sq]
+        board[from_sq] = piece
+        board[to_sq] = captured
+
+        to_bit = 1 << to_sq
+        self.occupied[piece.player] ^= (1 << from_sq) | to_bit
+        zobrist = zobrist_key(piece, from_row, from_col) ^ zobrist_key(piece, to_row, to_col)
+        if captured:
+            self.occupied[captured.player] ^= to_bit
+            zobrist ^= zobrist_key(captured, to_row, to_col)
+            if captured.code in _KING_CODES:
+                self.king_pos[captured.player] = (to_row, to_col)
+        if piece.code in _KING_CODES:
+            self.king_pos[piece.player] = (from_row, from_col)
+        self.zobrist ^= zobrist
+
     def display_board(self):
         """盤面を表示"""
         print("\n  ９８７６５４３２１")
@@ -91,8 +305,8 @@ class ShogiBoard:
         for i in range(9):
             row_str = f"{i+1}|"
             for j in range(9):
-                if self.board[i][j]:
-                    row_str += str(self.board[i][j])
+                if self.board[i * 9 + j]:
+                    row_str += str(self.board[i * 9 + j])
                 else:
                     row_str += "  "
             row_str += f"|{i+1}"
@@ -101,203 +315,185 @@ class ShogiBoard:
         print("  " + "─" * 18)
         print("  ９８７６５４３２１")
         
-        # 持ち駒表示
-        print(f"\n後手の持ち駒: {[str(p.piece_type) for p in self.captured_pieces[2]]}")
-        print(f"先手の持ち駒: {[str(p.piece_type) for p in self.captured_pieces[1]]}")
+        # 持ち駒表示（カウントを枚数ぶんの駒種リストに展開して表示）
+        hand2 = [t for t, n in self.captured_pieces[2].items() for _ in range(n)]
+        hand1 = [t for t, n in self.captured_pieces[1].items() for _ in range(n)]
+        print(f"\n後手の持ち駒: {hand2}")
+        print(f"先手の持ち駒: {hand1}")
         print(f"\n現在のプレイヤー: {'先手' if self.current_player == 1 else '後手'}")
     
+    def position_hash(self) -> int:
+        """現局面の Zobrist ハッシュを計算"""
+        h = 0
+        for sq in range(81):
+            piece = self.board[sq]
+            if piece:
+                row, col = divmod(sq, 9)
+                h ^= ZOBRIST_TABLE[(piece.piece_type, piece.player, piece.promoted, row, col)]
+        if self.current_player == 2:
+            h ^= ZOBRIST_PLAYER
+        return h
+
     def is_valid_position(self, row: int, col: int) -> bool:
         """座標が盤面内かチェック"""
         return 0 <= row < 9 and 0 <= col < 9
     
     def get_piece_moves(self, row: int, col: int) -> List[Tuple[int, int]]:
-        """指定位置の駒の可能な移動先を取得"""
-        piece = self.board[row][col]
+        """指定位置の駒の可能な移動先を取得（現局面でキャッシュ）"""
+        # 手番が変わると結果も変わるのでキーに含める。
+        # 盤面の変更は _apply_move/_undo_move がキャッシュをクリアする
+        key = (self.current_player, row, col)
+        moves = self._moves_cache.get(key)
+        if moves is None:
+            moves = self._compute_piece_moves(row, col)
+            self._moves_cache[key] = moves
+        return moves
+
+    def _compute_piece_moves(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """指定位置の駒の可能な移動先を計算"""
+        piece = self.board[row * 9 + col]
         if not piece or piece.player != self.current_player:
             return []
-        
-        moves = []
-        piece_type = piece.piece_type
-        player = piece.player
-        promoted = piece.promoted
-        
-        # 各駒の移動パターンを定義
-        if piece_type == '歩':
-            if not promoted:
-                # 前進のみ
-                dr = -1 if player == 1 else 1
-                new_row = row + dr
-                if self.is_valid_position(new_row, col):
-                    if not self.board[new_row][col] or self.board[new_row][col].player != player:
+
+        moves: List[Tuple[int, int]] = []
+        # 駒種コードでタプルを直接インデックス（辞書引きより速い）
+        code = piece.code
+        if code >= 0:
+            self._MOVE_GENERATORS[code](self, row, col, row * 9 + col,
+                                        piece.player, piece.promoted, moves)
+        return moves
+
+    # --- 駒種ごとの移動生成（_MOVE_GENERATORS から呼ばれる） ---
+
+    def _gen_pawn(self, row, col, sq, player, promoted, moves):
+        if not promoted:
+            # 前進のみ
+            self._step_moves(_PAWN_TABLE[player][sq], player, moves)
+        else:  # と金
+            # 金将と同じ動き
+            self._get_gold_moves(row, col, player, moves)
+
+    def _gen_king(self, row, col, sq, player, promoted, moves):
+        # 全方向1マス
+        self._step_moves(_KING_TABLE[sq], player, moves)
+
+    def _gen_gold(self, row, col, sq, player, promoted, moves):
+        self._get_gold_moves(row, col, player, moves)
+
+    def _gen_silver(self, row, col, sq, player, promoted, moves):
+        if not promoted:
+            # 斜め4方向と前1マス
+            self._step_moves(_SILVER_TABLE[player][sq], player, moves)
+        else:  # 成銀
+            self._get_gold_moves(row, col, player, moves)
+
+    def _gen_knight(self, row, col, sq, player, promoted, moves):
+        if not promoted:
+            # 桂馬の動き
+            self._step_moves(_KNIGHT_TABLE[player][sq], player, moves)
+        else:  # 成桂
+            self._get_gold_moves(row, col, player, moves)
+
+    def _gen_lance(self, row, col, sq, player, promoted, moves):
+        if not promoted:
+            # 香車の動き（前方直進）
+            board = self.board
+            direction = -1 if player == 1 else 1
+            for i in range(1, 9):
+                new_row = row + direction * i
+                if not 0 <= new_row < 9:
+                    break
+                if board[new_row * 9 + col]:
+                    if board[new_row * 9 + col].player != player:
                         moves.append((new_row, col))
-            else:  # と金
-                # 金将と同じ動き
-                moves.extend(self._get_gold_moves(row, col, player))
-        
-        elif piece_type in ['王', '玉']:
-            # 全方向1マス
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    new_row, new_col = row + dr, col + dc
-                    if self.is_valid_position(new_row, new_col):
-                        if not self.board[new_row][new_col] or self.board[new_row][new_col].player != player:
-                            moves.append((new_row, new_col))
-        
-        elif piece_type == '金':
-            moves.extend(self._get_gold_moves(row, col, player))
-        
-        elif piece_type == '銀':
-            if not promoted:
-                # 斜め4方向と前1マス
-                directions = [(-1, -1), (-1, 0), (-1, 1), (1, -1), (1, 1)]
-                if player == 2:  # 後手の場合は方向を反転
-                    directions = [(dr * -1, dc) for dr, dc in directions]
-                
-                for dr, dc in directions:
-                    new_row, new_col = row + dr, col + dc
-                    if self.is_valid_position(new_row, new_col):
-                        if not self.board[new_row][new_col] or self.board[new_row][new_col].player != player:
-                            moves.append((new_row, new_col))
-            else:  # 成銀
-                moves.extend(self._get_gold_moves(row, col, player))
-        
-        elif piece_type == '桂':
-            if not promoted:
-                # 桂馬の動き
-                if player == 1:
-                    knight_moves = [(-2, -1), (-2, 1)]
-                else:
-                    knight_moves = [(2, -1), (2, 1)]
-                
-                for dr, dc in knight_moves:
-                    new_row, new_col = row + dr, col + dc
-                    if self.is_valid_position(new_row, new_col):
-                        if not self.board[new_row][new_col] or self.board[new_row][new_col].player != player:
-                            moves.append((new_row, new_col))
-            else:  # 成桂
-                moves.extend(self._get_gold_moves(row, col, player))
-        
-        elif piece_type == '香':
-            if not promoted:
-                # 香車の動き（前方直進）
-                direction = -1 if player == 1 else 1
-                for i in range(1, 9):
-                    new_row = row + direction * i
-                    if not self.is_valid_position(new_row, col):
-                        break
-                    if self.board[new_row][col]:
-                        if self.board[new_row][col].player != player:
-                            moves.append((new_row, col))
-                        break
-                    moves.append((new_row, col))
-            else:  # 成香
-                moves.extend(self._get_gold_moves(row, col, player))
-        
-        elif piece_type == '角':
-            if not promoted:
-                # 角行の動き（斜め）
-                directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-                for dr, dc in directions:
-                    for i in range(1, 9):
-                        new_row, new_col = row + dr * i, col + dc * i
-                        if not self.is_valid_position(new_row, new_col):
-                            break
-                        if self.board[new_row][new_col]:
-                            if self.board[new_row][new_col].player != player:
-                                moves.append((new_row, new_col))
-                            break
-                        moves.append((new_row, new_col))
-            else:  # 馬
-                # 角行の動き + 王将の動き
-                moves.extend(self.get_piece_moves_for_type('角', row, col, player, False))
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if abs(dr) + abs(dc) == 1:  # 縦横1マス
-                            new_row, new_col = row + dr, col + dc
-                            if self.is_valid_position(new_row, new_col):
-                                if not self.board[new_row][new_col] or self.board[new_row][new_col].player != player:
-                                    moves.append((new_row, new_col))
-        
-        elif piece_type == '飛':
-            if not promoted:
-                # 飛車の動き（縦横）
-                directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                for dr, dc in directions:
-                    for i in range(1, 9):
-                        new_row, new_col = row + dr * i, col + dc * i
-                        if not self.is_valid_position(new_row, new_col):
-                            break
-                        if self.board[new_row][new_col]:
-                            if self.board[new_row][new_col].player != player:
-                                moves.append((new_row, new_col))
-                            break
+                    break
+                moves.append((new_row, col))
+        else:  # 成香
+            self._get_gold_moves(row, col, player, moves)
+
+    def _gen_bishop(self, row, col, sq, player, promoted, moves):
+        if not promoted:
+            # 角行の動き（斜め）
+            self._slide_moves(row, col, player, _BISHOP_DIRS, moves)
+        else:  # 馬
+            # 角行の動き + 縦横1マス
+            self._slide_moves(row, col, player, _BISHOP_DIRS, moves)
+            self._step_moves(_ORTHO_TABLE[sq], player, moves)
+
+    def _gen_rook(self, row, col, sq, player, promoted, moves):
+        if not promoted:
+            # 飛車の動き（縦横）
+            self._slide_moves(row, col, player, _ROOK_DIRS, moves)
+        else:  # 龍
+            # 飛車の動き + 斜め1マス
+            self._slide_moves(row, col, player, _ROOK_DIRS, moves)
+            self._step_moves(_DIAG_TABLE[sq], player, moves)
+
+    # 駒種コード -> 移動生成関数のディスパッチテーブル
+    # （_PIECE_TYPES の並び: 王 玉 飛 角 金 銀 桂 香 歩）
+    _MOVE_GENERATORS = (
+        _gen_king,    # 王
+        _gen_king,    # 玉
+        _gen_rook,    # 飛
+        _gen_bishop,  # 角
+        _gen_gold,    # 金
+        _gen_silver,  # 銀
+        _gen_knight,  # 桂
+        _gen_lance,   # 香
+        _gen_pawn,    # 歩
+    )
+
+    def _step_moves(self, targets, player: int, moves: List[Tuple[int, int]]):
+        """事前計算済みの移動先候補のうち、進入可能なマスを moves に追加"""
+        board = self.board
+        for new_sq, new_row, new_col in targets:
+            target = board[new_sq]
+            if not target or target.player != player:
+                moves.append((new_row, new_col))
+
+    def _slide_moves(self, row: int, col: int, player: int, directions, moves: List[Tuple[int, int]]):
+        """飛び駒（香・角・飛）の移動先を moves に追加"""
+        board = self.board
+        for dr, dc in directions:
+            new_row, new_col = row + dr, col + dc
+            while 0 <= new_row < 9 and 0 <= new_col < 9:
+                target = board[new_row * 9 + new_col]
+                if target:
+                    if target.player != player:
                         moves.append((new_row, new_col))
-            else:  # 龍
-                # 飛車の動き + 王将の動き
-                moves.extend(self.get_piece_moves_for_type('飛', row, col, player, False))
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if abs(dr) == abs(dc) == 1:  # 斜め1マス
-                            new_row, new_col = row + dr, col + dc
-                            if self.is_valid_position(new_row, new_col):
-                                if not self.board[new_row][new_col] or self.board[new_row][new_col].player != player:
-                                    moves.append((new_row, new_col))
-        
-        return moves
+                    break
+                moves.append((new_row, new_col))
+                new_row += dr
+                new_col += dc
     
     def get_piece_moves_for_type(self, piece_type: str, row: int, col: int, player: int, promoted: bool) -> List[Tuple[int, int]]:
         """特定の駒タイプの移動を取得（再帰防止用）"""
-        moves = []
+        # 角・飛の飛び駒ロジックは _slide_moves と同一なので共有する
+        moves: List[Tuple[int, int]] = []
         if piece_type == '角' and not promoted:
-            directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-            for dr, dc in directions:
-                for i in range(1, 9):
-                    new_row, new_col = row + dr * i, col + dc * i
-                    if not self.is_valid_position(new_row, new_col):
-                        break
-                    if self.board[new_row][new_col]:
-                        if self.board[new_row][new_col].player != player:
-                            moves.append((new_row, new_col))
-                        break
-                    moves.append((new_row, new_col))
+            self._slide_moves(row, col, player, _BISHOP_DIRS, moves)
         elif piece_type == '飛' and not promoted:
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            for dr, dc in directions:
-                for i in range(1, 9):
-                    new_row, new_col = row + dr * i, col + dc * i
-                    if not self.is_valid_position(new_row, new_col):
-                        break
-                    if self.board[new_row][new_col]:
-                        if self.board[new_row][new_col].player != player:
-                            moves.append((new_row, new_col))
-                        break
-                    moves.append((new_row, new_col))
+            self._slide_moves(row, col, player, _ROOK_DIRS, moves)
         return moves
     
-    def _get_gold_moves(self, row: int, col: int, player: int) -> List[Tuple[int, int]]:
-        """金将の移動パターン"""
-        moves = []
-        # 前、左右、斜め前2方向、後ろ
-        directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0)]
-        if player == 2:  # 後手の場合は方向を反転
-            directions = [(dr * -1, dc) for dr, dc in directions]
-        
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if self.is_valid_position(new_row, new_col):
-                if not self.board[new_row][new_col] or self.board[new_row][new_col].player != player:
-                    moves.append((new_row, new_col))
-        
-        return moves
+    def _get_gold_moves(self, row: int, col: int, player: int, moves: List[Tuple[int, int]]):
+        """金将の移動パターンを moves に追加"""
+        # 前、左右、斜め前2方向、後ろ（後手は向きを反転済みのテーブルを使用）
+        self._step_moves(_GOLD_TABLE[player][row * 9 + col], player, moves)
     
-    def move_piece(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
-        """駒を移動"""
-        if not self.is_valid_position(from_row, from_col) or not self.is_valid_position(to_row, to_col):
+    def move_piece(self, from_row: int, from_col: int, to_row: int, to_col: int,
+                   promote: Optional[bool] = None) -> bool:
+        """駒を移動
+
+        promote が None のまま成れるマスに入った場合は成らずに移動し、
+        pending_promotion に位置を記録する。呼び出し側（対話ループなど）は
+        set_promotion で後から成りを確定できる。
+        """
+        # 境界チェックはインライン（is_valid_position の呼び出しコスト節約）
+        if not (0 <= from_row < 9 and 0 <= from_col < 9 and 0 <= to_row < 9 and 0 <= to_col < 9):
             return False
         
-        piece = self.board[from_row][from_col]
+        piece = self.board[from_row * 9 + from_col]
         if not piece or piece.player != self.current_player:
             return False
         
@@ -307,48 +503,55 @@ class ShogiBoard:
             return False
         
         # 移動が自分の王を王手に晒すかチェック
-        captured_piece = self.board[to_row][to_col]
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
-        
+        captured_piece = self._apply_move(from_row, from_col, to_row, to_col)
+
         if self.is_in_check(self.current_player):
             # 移動を元に戻す
-            self.board[from_row][from_col] = piece
-            self.board[to_row][to_col] = captured_piece
+            self._undo_move(from_row, from_col, to_row, to_col, captured_piece)
             print("その移動は自分の王を王手に晒すため無効です。")
             return False
-        
-        # 移動を元に戻してから正式に実行
-        self.board[from_row][from_col] = piece
-        self.board[to_row][to_col] = captured_piece
-        
-        # 相手の駒を取る場合
+
+        # 合法手なので移動は盤面に残し、取った駒だけ処理する
         if captured_piece:
-            # 持ち駒に追加（成りを解除）
-            captured_piece.promoted = False
-            self.captured_pieces[self.current_player].append(captured_piece)
-        
-        # 駒を移動
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
-        
+            # 持ち駒のカウントを増やす（種類だけ記録するので成りは自然に解除）
+            hand = self.captured_pieces[self.current_player]
+            hand[captured_piece.piece_type] = hand.get(captured_piece.piece_type, 0) + 1
+
         # 成りの判定（簡略化）
+        self.pending_promotion = None
         if self._can_promote(piece, to_row):
-            promote = input("成りますか？ (y/n): ").lower() == 'y'
-            if promote:
+            if promote is None:
+                # 呼び出し側の判断待ち（set_promotion で確定）
+                self.pending_promotion = (to_row, to_col)
+            elif promote:
+                self.zobrist ^= zobrist_key(piece, to_row, to_col)
                 piece.promoted = True
-        
+                self.zobrist ^= zobrist_key(piece, to_row, to_col)
+                # 成りで移動範囲が変わるためキャッシュを破棄
+                self._moves_cache.clear()
+
         # プレイヤー交代
-        self.current_player = 2 if self.current_player == 1 else 1
+        self.current_player = 3 - self.current_player  # 1⇔2 を分岐なしで切り替え
         return True
+
+    def set_promotion(self, promote: bool):
+        """直前の移動で保留された成りを確定する"""
+        if self.pending_promotion and promote:
+            to_row, to_col = self.pending_promotion
+            piece = self.board[to_row * 9 + to_col]
+            self.zobrist ^= zobrist_key(piece, to_row, to_col)
+            piece.promoted = True
+            self.zobrist ^= zobrist_key(piece, to_row, to_col)
+            # 成りで移動範囲が変わるためキャッシュを破棄
+            self._moves_cache.clear()
+        self.pending_promotion = None
     
     def _can_promote(self, piece: ShogiPiece, row: int) -> bool:
         """成ることができるかチェック"""
         if piece.promoted:
             return False
         
-        promotable_pieces = ['歩', '香', '桂', '銀', '角', '飛']
-        if piece.piece_type not in promotable_pieces:
+        if piece.code not in _PROMOTABLE_CODES:
             return False
         
         # 敵陣（相手側の3段）に入った場合
@@ -361,67 +564,263 @@ class ShogiBoard:
     
     def find_king(self, player: int) -> Optional[Tuple[int, int]]:
         """指定プレイヤーの王将/玉将の位置を取得"""
-        king_types = ['王', '玉']
-        for row in range(9):
-            for col in range(9):
-                piece = self.board[row][col]
-                if piece and piece.player == player and piece.piece_type in king_types:
-                    return (row, col)
-        return None
+        # _apply_move/_undo_move が差分更新しているので走査不要
+        return self.king_pos.get(player)
     
     def is_in_check(self, player: int) -> bool:
         """指定プレイヤーが王手されているかチェック"""
         king_pos = self.find_king(player)
         if not king_pos:
             return False
-        
-        king_row, king_col = king_pos
-        opponent = 2 if player == 1 else 1
-        
-        # 相手の全ての駒から王将/玉将への攻撃をチェック
-        for row in range(9):
-            for col in range(9):
-                piece = self.board[row][col]
-                if piece and piece.player == opponent:
-                    valid_moves = self.get_piece_moves(row, col)
-                    if (king_row, king_col) in valid_moves:
+
+        opponent = 3 - player
+        return self._square_attacked_by(king_pos[0], king_pos[1], opponent)
+
+    def _square_attacked_by(self, row: int, col: int, attacker: int) -> bool:
+        """(row, col) に attacker の駒が利いているか
+
+        相手の全駒の移動先を生成する代わりに、対象マスから逆向きに
+        「そこに利く駒がいそうなマス」だけを調べる。非飛び駒は
+        attacker から見て逆向きの移動表を引けば候補マスが得られ、
+        飛び駒は対象マスから各方向の最初の駒だけ見ればよい。
+        """
+        board = self.board
+        sq = row * 9 + col
+        reverse = 3 - attacker
+
+        # 占有ビットボードと候補マスクの AND を先に取り、候補マスに
+        # attacker の駒が1枚もなければ個別チェックを丸ごとスキップする
+        occ = self.occupied[attacker]
+
+        if occ & _PAWN_MASK[reverse][sq]:
+            for t_sq, _r, _c in _PAWN_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code == _PAWN_CODE and not p.promoted:
+                    return True
+        if occ & _KNIGHT_MASK[reverse][sq]:
+            for t_sq, _r, _c in _KNIGHT_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code == _KNIGHT_CODE and not p.promoted:
+                    return True
+        if occ & _SILVER_MASK[reverse][sq]:
+            for t_sq, _r, _c in _SILVER_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code == _SILVER_CODE and not p.promoted:
+                    return True
+        # 金と同じ動きの駒（金・と金・成香・成桂・成銀）
+        if occ & _GOLD_MASK[reverse][sq]:
+            for t_sq, _r, _c in _GOLD_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker:
+                    code = p.code
+                    if code == _GOLD_CODE or (p.promoted and code in _GOLD_WHEN_PROMOTED_CODES):
                         return True
-        
+        if occ & _KING_MASK[sq]:
+            for t_sq, _r, _c in _KING_TABLE[sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code in _KING_CODES:
+                    return True
+            # 馬の縦横1マス・龍の斜め1マス（王マスクの部分集合）
+            for t_sq, _r, _c in _ORTHO_TABLE[sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.promoted and p.code == _BISHOP_CODE:
+                    return True
+            for t_sq, _r, _c in _DIAG_TABLE[sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.promoted and p.code == _ROOK_CODE:
+                    return True
+
+        # 飛び駒: 対象マスから各方向に走り、最初にぶつかった駒だけ調べる
+        lance_dr = 1 if attacker == 1 else -1  # attacker の香がいる側
+        for dr, dc in _ROOK_DIRS:
+            new_row, new_col = row + dr, col + dc
+            while 0 <= new_row < 9 and 0 <= new_col < 9:
+                p = board[new_row * 9 + new_col]
+                if p:
+                    if p.player == attacker and (
+                        p.code == _ROOK_CODE
+                        or (p.code == _LANCE_CODE and not p.promoted
+                            and dr == lance_dr and dc == 0)
+                    ):
+                        return True
+                    break
+                new_row += dr
+                new_col += dc
+        for dr, dc in _BISHOP_DIRS:
+            new_row, new_col = row + dr, col + dc
+            while 0 <= new_row < 9 and 0 <= new_col < 9:
+                p = board[new_row * 9 + new_col]
+                if p:
+                    if p.player == attacker and p.code == _BISHOP_CODE:
+                        return True
+                    break
+                new_row += dr
+                new_col += dc
+
         return False
     
+    def _attackers_of(self, row: int, col: int, attacker: int) -> List[Tuple[int, int]]:
+        """(row, col) に利いている attacker の駒の位置を列挙
+
+        _square_attacked_by と同じ逆引きだが、最初の1枚で打ち切らず
+        王手している駒を全て集める（回避手生成用）。
+        """
+        board = self.board
+        sq = row * 9 + col
+        reverse = 3 - attacker
+        occ = self.occupied[attacker]
+        attackers = []
+
+        if occ & _PAWN_MASK[reverse][sq]:
+            for t_sq, t_row, t_col in _PAWN_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code == _PAWN_CODE and not p.promoted:
+                    attackers.append((t_row, t_col))
+        if occ & _KNIGHT_MASK[reverse][sq]:
+            for t_sq, t_row, t_col in _KNIGHT_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code == _KNIGHT_CODE and not p.promoted:
+                    attackers.append((t_row, t_col))
+        if occ & _SILVER_MASK[reverse][sq]:
+            for t_sq, t_row, t_col in _SILVER_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code == _SILVER_CODE and not p.promoted:
+                    attackers.append((t_row, t_col))
+        if occ & _GOLD_MASK[reverse][sq]:
+            for t_sq, t_row, t_col in _GOLD_TABLE[reverse][sq]:
+                p = board[t_sq]
+                if p and p.player == attacker:
+                    code = p.code
+                    if code == _GOLD_CODE or (p.promoted and code in _GOLD_WHEN_PROMOTED_CODES):
+                        attackers.append((t_row, t_col))
+        if occ & _KING_MASK[sq]:
+            for t_sq, t_row, t_col in _KING_TABLE[sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.code in _KING_CODES:
+                    attackers.append((t_row, t_col))
+            for t_sq, t_row, t_col in _ORTHO_TABLE[sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.promoted and p.code == _BISHOP_CODE:
+                    attackers.append((t_row, t_col))
+            for t_sq, t_row, t_col in _DIAG_TABLE[sq]:
+                p = board[t_sq]
+                if p and p.player == attacker and p.promoted and p.code == _ROOK_CODE:
+                    attackers.append((t_row, t_col))
+
+        lance_dr = 1 if attacker == 1 else -1
+        for dr, dc in _ROOK_DIRS:
+            new_row, new_col = row + dr, col + dc
+            while 0 <= new_row < 9 and 0 <= new_col < 9:
+                p = board[new_row * 9 + new_col]
+                if p:
+                    if p.player == attacker and (
+                        p.code == _ROOK_CODE
+                        or (p.code == _LANCE_CODE and not p.promoted
+                            and dr == lance_dr and dc == 0)
+                    ):
+                        attackers.append((new_row, new_col))
+                    break
+                new_row += dr
+                new_col += dc
+        for dr, dc in _BISHOP_DIRS:
+            new_row, new_col = row + dr, col + dc
+            while 0 <= new_row < 9 and 0 <= new_col < 9:
+                p = board[new_row * 9 + new_col]
+                if p:
+                    if p.player == attacker and p.code == _BISHOP_CODE:
+                        attackers.append((new_row, new_col))
+                    break
+                new_row += dr
+                new_col += dc
+
+        return attackers
+
+    @staticmethod
+    def _between_squares(kr: int, kc: int, ar: int, ac: int) -> List[Tuple[int, int]]:
+        """王 (kr, kc) と攻撃駒 (ar, ac) の間にあるマスを列挙
+
+        縦横斜めに並んでいない（桂など）場合は空リストを返す。
+        """
+        dr, dc = ar - kr, ac - kc
+        if not (dr == 0 or dc == 0 or abs(dr) == abs(dc)):
+            return []
+        step_r = (dr > 0) - (dr < 0)
+        step_c = (dc > 0) - (dc < 0)
+        squares = []
+        new_row, new_col = kr + step_r, kc + step_c
+        while (new_row, new_col) != (ar, ac):
+            squares.append((new_row, new_col))
+            new_row += step_r
+            new_col += step_c
+        return squares
+
     def can_escape_check(self, player: int) -> bool:
         """王手を回避できるかチェック"""
-        if not self.is_in_check(player):
+        king_pos = self.find_king(player)
+        if not king_pos:
+            return True  # 王がいなければ王手もない
+
+        kr, kc = king_pos
+        opponent = 3 - player
+        checkers = self._attackers_of(kr, kc, opponent)
+        if not checkers:
             return True  # 王手されていない
-        
-        # 自分の全ての駒で可能な移動を試す
-        for from_row in range(9):
-            for from_col in range(9):
-                piece = self.board[from_row][from_col]
-                if piece and piece.player == player:
-                    valid_moves = self.get_piece_moves(from_row, from_col)
-                    
-                    for to_row, to_col in valid_moves:
-                        # 移動をシミュレート
-                        original_piece = self.board[to_row][to_col]
-                        self.board[to_row][to_col] = piece
-                        self.board[from_row][from_col] = None
-                        
-                        # 移動後に王手が解除されるかチェック
-                        check_escaped = not self.is_in_check(player)
-                        
-                        # 移動を元に戻す
-                        self.board[from_row][from_col] = piece
-                        self.board[to_row][to_col] = original_piece
-                        
-                        if check_escaped:
+
+        # 回避の候補は「王自身の移動」「王手駒を取る」「合駒」だけ。
+        # 全駒の全移動を試すより桁違いに少ない候補で済む
+        apply_move = self._apply_move
+        undo_move = self._undo_move
+        is_in_check = self.is_in_check
+
+        # 手番に関係なく player 側の手を生成できるよう一時的に切り替える
+        saved_player = self.current_player
+        self.current_player = player
+        try:
+            # 1) 王自身の移動（両王手はこれ以外に回避手がない）
+            for to_row, to_col in self.get_piece_moves(kr, kc):
+                captured = apply_move(kr, kc, to_row, to_col)
+                escaped = not is_in_check(player)
+                undo_move(kr, kc, to_row, to_col, captured)
+                if escaped:
+                    return True
+
+            if len(checkers) == 1:
+                # 2) 王手駒を取る・間に合駒する
+                ar, ac = checkers[0]
+                targets = {(ar, ac)}
+                targets.update(self._between_squares(kr, kc, ar, ac))
+
+                occ = self.occupied[player] & ~(1 << (kr * 9 + kc))
+                while occ:
+                    lsb = occ & -occ
+                    occ ^= lsb
+                    from_row, from_col = divmod(lsb.bit_length() - 1, 9)
+                    for to_row, to_col in self.get_piece_moves(from_row, from_col):
+                        if (to_row, to_col) not in targets:
+                            continue
+                        captured = apply_move(from_row, from_col, to_row, to_col)
+                        escaped = not is_in_check(player)
+                        undo_move(from_row, from_col, to_row, to_col, captured)
+                        if escaped:
                             return True
-        
+        finally:
+            self.current_player = saved_player
+            self._moves_cache.clear()
+
         return False
     
     def is_checkmate(self, player: int) -> bool:
-        """指定プレイヤーが詰みかチェック"""
-        return self.is_in_check(player) and not self.can_escape_check(player)
+        """指定プレイヤーが詰みかチェック（局面ごとにメモ化）"""
+        # 盤面ハッシュは _apply_move/_undo_move が差分維持している。
+        # 詰み判定は盤面とプレイヤーだけで決まるのでこれをキーにできる
+        key = (self.zobrist, player)
+        cached = self._checkmate_cache.get(key)
+        if cached is None:
+            cached = self.is_in_check(player) and not self.can_escape_check(player)
+            if len(self._checkmate_cache) >= 4096:
+                self._checkmate_cache.clear()
+            self._checkmate_cache[key] = cached
+        return cached
     
     def get_game_status(self) -> Dict[str, any]:
         """ゲーム状態を取得"""
@@ -447,6 +846,79 @@ class ShogiBoard:
             'player2_checkmate': player2_checkmate
         }
 
+# 持ち駒になりうる駒種（王・玉を除いた7種、_PIECE_TYPES の並び）
+_HAND_TYPES = _PIECE_TYPES[2:]
+
+
+class BatchShogiBoards:
+    """複数局面を SoA（列ごとの連続配列）で蓄積するコンテナ
+
+    局面ごとに ShogiPiece オブジェクトを散らばった AoS で持つ代わりに、
+    駒種コード・プレイヤー・成りフラグを列ごとに連続した array.array へ
+    積む。自己対局バッファやデータセット生成などの一括分析でメモリ
+    局所性がよく、バイト列のまま外部の数値ライブラリにも渡せる。
+    """
+
+    def __init__(self):
+        self.piece_code = array.array('b')      # N*81: 駒種コード（空マスは -1）
+        self.player = array.array('b')          # N*81: 所有プレイヤー（空マスは 0）
+        self.promoted = array.array('b')        # N*81: 成りフラグ（0/1）
+        self.hand = array.array('b')            # N*14: 持ち駒枚数（先手7種 + 後手7種）
+        self.current_player = array.array('b')  # N: 手番
+
+    def __len__(self) -> int:
+        return len(self.current_player)
+
+    def append(self, board: 'ShogiBoard'):
+        """現局面のスナップショットを末尾に追加"""
+        piece_code = self.piece_code
+        player = self.player
+        promoted = self.promoted
+        for sq in range(81):
+            piece = board.board[sq]
+            if piece:
+                piece_code.append(piece.code)
+                player.append(piece.player)
+                promoted.append(1 if piece.promoted else 0)
+            else:
+                piece_code.append(-1)
+                player.append(0)
+                promoted.append(0)
+        for side in (1, 2):
+            hand = board.captured_pieces[side]
+            for piece_type in _HAND_TYPES:
+                self.hand.append(hand.get(piece_type, 0))
+        self.current_player.append(board.current_player)
+
+    def restore(self, index: int) -> 'ShogiBoard':
+        """index 番目のスナップショットから ShogiBoard を復元"""
+        if not 0 <= index < len(self):
+            raise IndexError("スナップショットが存在しません")
+        board = ShogiBoard()
+        board.board = [None] * 81
+        base = index * 81
+        for sq in range(81):
+            code = self.piece_code[base + sq]
+            if code >= 0:
+                board.board[sq] = ShogiPiece(
+                    _PIECE_TYPES[code],
+                    self.player[base + sq],
+                    bool(self.promoted[base + sq]),
+                )
+        hand_base = index * 2 * len(_HAND_TYPES)
+        for side_index, side in enumerate((1, 2)):
+            hand: Dict[str, int] = {}
+            for type_index, piece_type in enumerate(_HAND_TYPES):
+                count = self.hand[hand_base + side_index * len(_HAND_TYPES) + type_index]
+                if count:
+                    hand[piece_type] = count
+            board.captured_pieces[side] = hand
+        board.current_player = self.current_player[index]
+        board._rebuild_occupied()
+        board._moves_cache.clear()
+        return board
+
+
 class ShogiGame:
     """将棋ゲームのメインクラス"""
     
@@ -511,6 +983,10 @@ class ShogiGame:
                 
                 if self.board.move_piece(from_row, from_col, to_row, to_col):
                     print("移動しました")
+                    # 成りの選択は対話ループ側で行う（move_piece は入出力しない）
+                    if self.board.pending_promotion:
+                        promote = input("成りますか？ (y/n): ").lower() == 'y'
+                        self.board.set_promotion(promote)
                 else:
                     print("無効な移動です")
                 